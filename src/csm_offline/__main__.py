@@ -1,7 +1,10 @@
 """Entrypoint for the CSM Offline application."""
+import argparse
+import concurrent.futures
 import logging
 import pathlib
 import tempfile
+from collections.abc import Iterable, Sequence
 
 from csm_offline import cli, config, image_search, io, workbench
 
@@ -15,7 +18,38 @@ def main() -> None:
     """Run the CSM Offline application."""
     args = cli.parse_arguments()
     config.setup_logger(args.verbosity)
+    run(args)
 
+
+def serve(
+    argument_lists: Iterable[Sequence[str]],
+    verbosity: str | int | None = None,
+) -> None:
+    """Run the CSM Offline application for multiple sets of arguments.
+
+    The argument parser, logger, and reference feature data are set up once
+    and shared by all runs.
+
+    Args:
+        argument_lists: The command line arguments of each run, excluding the
+            program name.
+        verbosity: The verbosity level for the logger.
+    """
+    config.setup_logger(verbosity)
+    parser = cli.build_parser()
+    features = io.FeatureData.from_data_dir()
+    for arguments in argument_lists:
+        run(parser.parse_args(arguments), features)
+
+
+def run(args: argparse.Namespace, features: io.FeatureData | None = None) -> None:
+    """Run the CSM Offline computation for a single set of input files.
+
+    Args:
+        args: The parsed command line arguments.
+        features: The reference feature data. If None, it is loaded from the
+            data directory.
+    """
     logger = logging.getLogger(LOGGER_NAME)
     logger.info(
         "Running CSM Offline with input file %s and %s.",
@@ -27,14 +61,25 @@ def main() -> None:
     user_data = io.load_user_data(args.input_left, args.input_right)
 
     logger.info("Calculating feature similarity.")
-    features = io.FeatureData.from_data_dir()
+    if features is None:
+        features = io.FeatureData.from_data_dir()
     similarity = features.feature_similarity(weights=user_data, species=args.species)
 
-    logger.info("Computing Neuroquery terms and studies.")
-    neuroquery = run_neuroquery(similarity, args.species, args.n_terms, args.n_studies)
+    with concurrent.futures.ThreadPoolExecutor(1) as executor:
+        logger.info("Saving similarity maps.")
+        similarity_saved = executor.submit(save_similarity, similarity, args.output)
+
+        logger.info("Computing Neuroquery terms and studies.")
+        neuroquery = run_neuroquery(
+            similarity,
+            args.species,
+            args.n_terms,
+            args.n_studies,
+        )
 
-    logger.info("Saving output.")
-    save_output(similarity, neuroquery, args.output)
+        logger.info("Saving Neuroquery output.")
+        save_neuroquery(neuroquery, args.output)
+        similarity_saved.result()
 
 
 def run_neuroquery(
@@ -58,13 +103,26 @@ def run_neuroquery(
         io.SurfaceFiles[f"{species.upper()}_LEFT"].value,
         io.SurfaceFiles[f"{species.upper()}_RIGHT"].value,
     ]
-    with tempfile.TemporaryDirectory() as temp_dir:
+    with (
+        concurrent.futures.ThreadPoolExecutor(1) as executor,
+        tempfile.TemporaryDirectory() as temp_dir,
+    ):
+        # Load the NeuroQuery model while Workbench maps the similarity to volume.
+        engine_loaded = executor.submit(image_search.get_engine)
         temp_volume_path = pathlib.Path(temp_dir) / "volume.nii.gz"
         temp_surface_left_path = pathlib.Path(temp_dir) / "surface_left.surf.gii"
         temp_surface_right_path = pathlib.Path(temp_dir) / "surface_right.surf.gii"
 
-        io.array_to_gifti(similarity.human_left, temp_surface_left_path)
-        io.array_to_gifti(similarity.human_right, temp_surface_right_path)
+        io.array_to_gifti(
+            similarity.human_left,
+            temp_surface_left_path,
+            compress=False,
+        )
+        io.array_to_gifti(
+            similarity.human_right,
+            temp_surface_right_path,
+            compress=False,
+        )
 
         workbench.multi_surface_to_volume(
             [temp_surface_left_path, temp_surface_right_path],
@@ -73,30 +131,48 @@ def run_neuroquery(
             temp_volume_path,
         )
 
+        engine_loaded.result()
         return image_search.search(temp_volume_path, n_terms, n_studies)
 
 
-def save_output(
-    similarity: io.FeatureData,
+def save_similarity(similarity: io.FeatureData, output_prefix: str) -> None:
+    """Save the similarity maps of the CSM offline computation to disk.
+
+    The four gifti files are written concurrently.
+
+    Args:
+        similarity: The similarity data to save.
+        output_prefix: The prefix to use for the output filenames.
+    """
+    outputs = [
+        (
+            getattr(similarity, f"{species}_{side}"),
+            OUTPUT_DIR / f"{output_prefix}_{species}_{side}.func.gii",
+        )
+        for species in ("human", "macaque")
+        for side in ("left", "right")
+    ]
+    with concurrent.futures.ThreadPoolExecutor(len(outputs)) as executor:
+        futures = [
+            executor.submit(io.array_to_gifti, array, filepath)
+            for array, filepath in outputs
+        ]
+        for future in futures:
+            future.result()
+
+
+def save_neuroquery(
     neuroquery: image_search.ImageSearchResult,
     output_prefix: str,
 ) -> None:
-    """Save the output of the CSM offline computation to disk.
+    """Save the Neuroquery terms and studies of the CSM offline computation to disk.
 
     Args:
-        similarity: The similarity data to save.
         neuroquery: The neuroquery data to save.
         output_prefix: The prefix to use for the output filenames.
     """
-    for species in ("human", "macaque"):
-        for side in ("left", "right"):
-            io.array_to_gifti(
-                getattr(similarity, f"{species}_{side}"),
-                OUTPUT_DIR / f"{output_prefix}_{species}_{side}.func.gii",
-            )
     for dataframe_name in ("terms", "studies"):
         neuroquery[dataframe_name].to_json(  # type: ignore[literal-required]
             OUTPUT_DIR / f"{output_prefix}_neuroquery_{dataframe_name}.json",
             orient="records",
-            indent=4,
         )
@@ -9,13 +9,31 @@ logger = logging.getLogger(settings.LOGGER_NAME)
 INPUT_DIR = settings.INPUT_DIR
 
 
-def parse_arguments() -> argparse.Namespace:
+def parse_arguments(
+    parser: argparse.ArgumentParser | None = None,
+) -> argparse.Namespace:
     """Parse command line arguments for CSM Offline.
 
+    Args:
+        parser: The argument parser to use. If None, a new parser is built.
+
     Returns:
         argparse.Namespace: The parsed arguments.
     """
     logger.info("Parsing Arguments")
+    if parser is None:
+        parser = build_parser()
+    args = parser.parse_args()
+    logger.debug("Arguments parsed: %s", args)
+    return args
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line argument parser for CSM Offline.
+
+    Returns:
+        argparse.ArgumentParser: The argument parser.
+    """
     parser = argparse.ArgumentParser(
         description="CSM Offline: A tool for processing Cross Species Mapper data.",
         epilog="To report a bug, please raise an issue at https://github.com/cmi-dair/csm-offline-computation.",
@@ -70,6 +88,4 @@ def parse_arguments() -> argparse.Namespace:
         "or 'critical'. This primarily intended for developer usage.",
         choices=[10, 20, 30, 40, 50],
     )
-    args = parser.parse_args()
-    logger.debug("Arguments parsed: %s", args)
-    return args
+    return parser
@@ -1,4 +1,5 @@
 """Module for interactions with the NeuroQuery Image Search model."""
+import functools
 import logging
 import pathlib
 from typing import TypedDict
@@ -53,5 +54,19 @@ def search(
 
     """
     logger.info("Running NeuroQuery Image Search for %s", image_path)
-    neuroquery = neuroquery_image_search.NeuroQueryImageSearch()
+    neuroquery = get_engine()
     return neuroquery(image_path, n_studies=n_studies, n_terms=n_terms)
+
+
+@functools.lru_cache(maxsize=1)
+def get_engine() -> neuroquery_image_search.NeuroQueryImageSearch:
+    """Cached call to the NeuroQuery Image Search model.
+
+    Loading the model is slow, so it is only done once per process.
+
+    Returns:
+        neuroquery_image_search.NeuroQueryImageSearch: The search model.
+
+    """
+    logger.debug("Loading NeuroQuery Image Search model.")
+    return neuroquery_image_search.NeuroQueryImageSearch()
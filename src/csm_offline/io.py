@@ -1,5 +1,7 @@
 """Input/output functionality for the CSM offline package."""
+import concurrent.futures
 import enum
+import functools
 import logging
 import pathlib
 
@@ -67,6 +69,10 @@ class SurfaceFiles(enum.Enum):
 class FeatureData:
     """A class representing feature data.
 
+    The four hemispheres are stored in a single contiguous array; the
+    per-hemisphere attributes and the `human`, `macaque`, and `all_data`
+    properties are views into it.
+
     Attributes:
         human_left (np.ndarray): The feature data for the human left.
         human_right (np.ndarray): The feature data for the human right.
@@ -83,16 +89,60 @@ class FeatureData:
     ) -> None:
         """Initialize a FeatureData instance.
 
+        The input data is always copied into a new contiguous array.
+
         Args:
             human_left: The feature data for the human left.
             human_right: The feature data for the human right.
             macaque_left: The feature data for the macaque left.
             macaque_right: The feature data for the macaque right.
         """
-        self.human_left = np.array(human_left)
-        self.human_right = np.array(human_right)
-        self.macaque_left = np.array(macaque_left)
-        self.macaque_right = np.array(macaque_right)
+        arrays = [
+            np.asarray(array, dtype=np.float32)
+            for array in (human_left, human_right, macaque_left, macaque_right)
+        ]
+        self._set_data(
+            np.concatenate(arrays),
+            np.cumsum([array.shape[0] for array in arrays[:-1]]),
+        )
+
+    @classmethod
+    def _from_contiguous(
+        cls,
+        all_data: np.ndarray,
+        offsets: np.ndarray,
+    ) -> "FeatureData":
+        """Create a FeatureData instance that wraps an existing array.
+
+        Args:
+            all_data: The float32 feature data of all four hemispheres, in the
+                order human left, human right, macaque left, macaque right. It
+                is used without copying.
+            offsets: The indices at which all_data is split into hemispheres.
+
+        Returns:
+            FeatureData: The feature data.
+
+        """
+        feature_data = cls.__new__(cls)
+        feature_data._set_data(all_data, offsets)  # noqa: SLF001
+        return feature_data
+
+    def _set_data(self, all_data: np.ndarray, offsets: np.ndarray) -> None:
+        """Store the feature data and split it into hemisphere views.
+
+        Args:
+            all_data: The feature data of all four hemispheres.
+            offsets: The indices at which all_data is split into hemispheres.
+        """
+        self._all_data = all_data
+        self._offsets = offsets
+        (
+            self.human_left,
+            self.human_right,
+            self.macaque_left,
+            self.macaque_right,
+        ) = np.split(self._all_data, self._offsets)
 
     @classmethod
     def from_data_dir(cls) -> "FeatureData":
@@ -103,10 +153,17 @@ class FeatureData:
 
         """
         logger.info("Loading feature data from %s.", DATA_DIR)
-        human_left = cls.load_from_h5(FeatureFiles.HUMAN_LEFT.value)
-        human_right = cls.load_from_h5(FeatureFiles.HUMAN_RIGHT.value)
-        macaque_left = cls.load_from_h5(FeatureFiles.MACAQUE_LEFT.value)
-        macaque_right = cls.load_from_h5(FeatureFiles.MACAQUE_RIGHT.value)
+        filepaths = [
+            FeatureFiles.HUMAN_LEFT.value,
+            FeatureFiles.HUMAN_RIGHT.value,
+            FeatureFiles.MACAQUE_LEFT.value,
+            FeatureFiles.MACAQUE_RIGHT.value,
+        ]
+        with concurrent.futures.ThreadPoolExecutor(len(filepaths)) as executor:
+            human_left, human_right, macaque_left, macaque_right = executor.map(
+                cls.load_from_h5,
+                filepaths,
+            )
         return cls(human_left, human_right, macaque_left, macaque_right)
 
     def feature_similarity(self, weights: npt.ArrayLike, species: str) -> "FeatureData":
@@ -122,36 +179,61 @@ class FeatureData:
         """
         logger.debug("Calculating feature similarity.")
         species_data = getattr(self, species)
-        user_feature = np.average(species_data, weights=weights, axis=0)
-        similarity = _cosine_similarity(
-            np.atleast_2d(user_feature),
-            self.all_data,
+        weights = np.asarray(weights, dtype=species_data.dtype)
+        weights_sum = weights.sum()
+        if weights_sum == 0:
+            message = "Weights sum to zero, cannot compute a weighted average."
+            logger.exception(message)
+            raise ZeroDivisionError(message)
+        user_feature = (weights @ species_data) / weights_sum
+        similarity = _normalized_similarity(
+            _normalize_rows(np.atleast_2d(user_feature)),
+            self._all_data_normalized,
         ).squeeze()
-        return FeatureData(
-            similarity[: self.human_left.shape[0]],
-            similarity[self.human_left.shape[0] : self.human.shape[0]],
-            similarity[
-                self.human.shape[0] : (self.human.shape[0] + self.macaque_left.shape[0])
-            ],
-            similarity[(self.human.shape[0] + self.macaque_left.shape[0]) :],
-        )
+        return FeatureData._from_contiguous(similarity, self._offsets)
+
+    @functools.cached_property
+    def _all_data_normalized(self) -> np.ndarray:
+        """Get all feature data with each vertex scaled to unit norm.
+
+        The reference features do not change between queries, so the
+        normalization is computed once and reused by `feature_similarity`.
+
+        Returns:
+            np.ndarray: The normalized feature data.
+
+        """
+        logger.debug("Normalizing all feature data.")
+        return _normalize_rows(self._all_data)
 
     @staticmethod
     def load_from_h5(filepath: pathlib.Path) -> np.ndarray:
         """Load feature data from an HDF5 file.
 
+        Contiguous float32 datasets are memory-mapped rather than read into
+        memory. In that case the returned array is a read-only `np.memmap`
+        that keeps the file mapped for as long as it is referenced. Other
+        datasets are read into a new, writable array.
+
         Args:
             filepath: The path to the HDF5 file.
 
         Returns:
-            np.ndarray: The feature data.
+            np.ndarray: The feature data, cast to float32.
 
         """
         logger.debug("Loading feature data from %s.", filepath)
         with h5py.File(filepath, "r") as h5:
-            return h5["data"][:].squeeze()
-
-    @property
+            dataset = h5["data"]
+            offset = dataset.id.get_offset()
+            if offset is None:
+                # Chunked or compressed datasets cannot be memory-mapped.
+                return dataset.astype(np.float32)[:].squeeze()
+            shape, dtype = dataset.shape, dataset.dtype
+        data = np.memmap(filepath, dtype=dtype, mode="r", offset=offset, shape=shape)
+        return data.astype(np.float32, copy=False).squeeze()
+
+    @functools.cached_property
     def human(self) -> np.ndarray:
         """Get the human feature data.
 
@@ -160,9 +242,10 @@ class FeatureData:
 
         """
         logger.debug("Getting human feature data.")
-        return np.concatenate((self.human_left, self.human_right))
+        n_human = self.human_left.shape[0] + self.human_right.shape[0]
+        return self._all_data[:n_human]
 
-    @property
+    @functools.cached_property
     def macaque(self) -> np.ndarray:
         """Get the macaque feature data.
 
@@ -171,9 +254,10 @@ class FeatureData:
 
         """
         logger.debug("Getting macaque feature data.")
-        return np.concatenate((self.macaque_left, self.macaque_right))
+        n_human = self.human_left.shape[0] + self.human_right.shape[0]
+        return self._all_data[n_human:]
 
-    @property
+    @functools.cached_property
     def all_data(self) -> np.ndarray:
         """Get all feature data.
 
@@ -182,7 +266,7 @@ class FeatureData:
 
         """
         logger.debug("Getting all feature data.")
-        return np.concatenate((self.human, self.macaque))
+        return self._all_data
 
 
 def load_user_data(*args: pathlib.Path) -> np.ndarray:
@@ -235,22 +319,63 @@ def _cosine_similarity(
         result in an infinite result for a cosine similarity of 1.
 
     """
-    threshold = 0.9999
-    cosine_similarity = np.dot(seed_features, np.transpose(target_features)) / (
-        np.linalg.norm(seed_features, axis=1)[:, np.newaxis]
-        * np.linalg.norm(target_features, axis=1)[np.newaxis, :]
+    return _normalized_similarity(
+        _normalize_rows(seed_features),
+        _normalize_rows(target_features),
     )
-    cosine_similarity[cosine_similarity > threshold] = threshold
-    cosine_similarity[cosine_similarity < -threshold] = -threshold
-    cosine_similarity[np.isnan(cosine_similarity)] = 0
+
+
+def _normalized_similarity(
+    seed_normalized: np.ndarray,
+    target_normalized: np.ndarray,
+) -> np.ndarray:
+    """Computes the thresholded similarity between two sets of normalized features.
+
+    Args:
+        seed_normalized: The row-normalized features on the seed surface.
+        target_normalized: The row-normalized features on the target surface.
+
+    Returns:
+        A vector of similarities per vertex, thresholded as described in
+        `_cosine_similarity`.
+
+    """
+    threshold = 0.9999
+    cosine_similarity = seed_normalized @ target_normalized.T
+    np.clip(cosine_similarity, -threshold, threshold, out=cosine_similarity)
     return cosine_similarity
 
 
+def _normalize_rows(features: npt.ArrayLike) -> np.ndarray:
+    """Scales each row of a feature matrix to unit L2 norm.
+
+    Args:
+        features: The features to normalize, one row per vertex.
+
+    Returns:
+        The normalized features as a float32 array. Rows with a zero or
+        non-finite norm are set to zero, so their similarity to any vertex is
+        zero.
+
+    """
+    features = np.asarray(features, dtype=np.float32)
+    # Accumulate in float64 so that large rows do not overflow to an infinite norm.
+    squared_norms = np.einsum("ij,ij->i", features, features, dtype=np.float64)
+    norms = np.sqrt(squared_norms).astype(np.float32)[:, np.newaxis]
+    return np.divide(
+        features,
+        norms,
+        out=np.zeros_like(features),
+        where=np.isfinite(norms) & (norms > 0),
+    )
+
+
 def array_to_gifti(
     array: np.ndarray,
     filepath: pathlib.Path,
     *,
     allow_cast: bool = True,
+    compress: bool = True,
 ) -> None:
     """Save an array as a gifti file.
 
@@ -259,21 +384,26 @@ def array_to_gifti(
         filepath: The path to the output file.
         allow_cast: Whether to allow casting the array to a type compatible with
             gifti files.
+        compress: Whether to gzip the data array. Disabling compression is
+            faster for intermediate files that are read back immediately.
 
     """
     logger.info("Saving array to %s.", filepath)
     image = nibabel.gifti.GiftiImage()
+    encoding = "GIFTI_ENCODING_B64GZ" if compress else "GIFTI_ENCODING_B64BIN"
     if not allow_cast:
-        data_array = nibabel.gifti.GiftiDataArray(data=array)
+        data_array = nibabel.gifti.GiftiDataArray(data=array, encoding=encoding)
     elif np.issubdtype(array.dtype, np.integer):
         data_array = nibabel.gifti.GiftiDataArray(
-            data=np.array(array),
+            data=np.asarray(array, dtype=np.int32),
             datatype="NIFTI_TYPE_INT32",
+            encoding=encoding,
         )
     elif np.issubdtype(array.dtype, np.floating):
         data_array = nibabel.gifti.GiftiDataArray(
-            data=np.array(array),
+            data=np.asarray(array, dtype=np.float32),
             datatype="NIFTI_TYPE_FLOAT32",
+            encoding=encoding,
         )
     else:
         message = f"Array of type {array.dtype} cannot be saved as a gifti file."
@@ -12,6 +12,9 @@ logger = logging.getLogger(settings.LOGGER_NAME)
 
 WORKBENCH_PATH = settings.WORKBENCH_PATH
 
+# Workbench executables that passed _probe_workbench.
+_AVAILABLE_EXECUTABLES: set[str] = set()
+
 
 def multi_surface_to_volume(
     metrics: Sequence[pathlib.Path],
@@ -35,25 +38,39 @@ def multi_surface_to_volume(
         logger.exception(message)
         raise ValueError(message)
 
-    volume_files = []
     wb = Workbench()
     with tempfile.TemporaryDirectory() as temp_dir:
-        for index in range(len(metrics)):
-            metric = metrics[index]
-            surface = surfaces[index]
-            volume_file = pathlib.Path(temp_dir) / f"volume_{index}.nii.gz"
-            wb.surface_to_volume(
-                metric,
-                surface,
-                volume_space,
-                volume_file,
-                distance,
+        # Intermediate volumes are uncompressed to spare Workbench a gzip
+        # round-trip on files that are only read once.
+        volume_files = [
+            pathlib.Path(temp_dir) / f"volume_{index}.nii"
+            for index in range(len(metrics))
+        ]
+        commands = []
+        for metric, surface, volume_file in zip(
+            metrics,
+            surfaces,
+            volume_files,
+            strict=True,
+        ):
+            _check_surface_to_volume_files(metric, surface, volume_space, volume_file)
+            commands.append(
+                wb.surface_to_volume_command(
+                    metric,
+                    surface,
+                    volume_space,
+                    volume_file,
+                    distance,
+                ),
             )
-            volume_files.append(volume_file)
+        logger.info("Converting surfaces %s to volumes.", list(surfaces))
+        _logged_subprocess_run_concurrent(commands)
 
-        average_expression = "({}) / {}".format(
+        # Hemispheres rarely overlap in volume space, so only average over the
+        # volumes that have data in a voxel rather than over all volumes.
+        average_expression = "({}) / max(1, {})".format(
             " + ".join(f"x{i}" for i in range(len(volume_files))),
-            len(volume_files),
+            " + ".join(f"(x{i} != 0)" for i in range(len(volume_files))),
         )
         wb.volume_math(average_expression, volume_out, volume_files)
 
@@ -128,35 +145,101 @@ class Workbench:
 
         """
         logger.info("Converting surface %s to volume %s.", surface, volume_out)
-        _raise_error_if_file_does_not_exist(metric)
-        _raise_error_if_file_does_not_exist(surface)
-        _raise_error_if_file_does_not_exist(volume_space)
-        _raise_error_if_file_exists(volume_out)
-
+        _check_surface_to_volume_files(metric, surface, volume_space, volume_out)
         _logged_subprocess_run(
-            [
-                self.executable,
-                "-metric-to-volume-mapping",
-                str(metric),
-                str(surface),
-                str(volume_space),
-                str(volume_out),
-                "-nearest-vertex",
-                str(distance),
-            ],
+            self.surface_to_volume_command(
+                metric,
+                surface,
+                volume_space,
+                volume_out,
+                distance,
+            ),
         )
 
+    def surface_to_volume_command(  # noqa: PLR0913
+        self,
+        metric: pathlib.Path,
+        surface: pathlib.Path,
+        volume_space: pathlib.Path,
+        volume_out: pathlib.Path,
+        distance: float = 3.0,
+    ) -> list[str]:
+        """Build the command that converts surface data to volume data.
+
+        The files are not checked; see `surface_to_volume`.
+
+        Args:
+            metric: The metric file.
+            surface: The surface file.
+            volume_space: The volume space file.
+            volume_out: The output volume file.
+            distance: The distance to use for the surface to volume conversion.
+
+        Returns:
+            list[str]: The Workbench command.
+
+        """
+        return [
+            self.executable,
+            "-metric-to-volume-mapping",
+            str(metric),
+            str(surface),
+            str(volume_space),
+            str(volume_out),
+            "-nearest-vertex",
+            str(distance),
+        ]
+
     def _is_workbench_available(self) -> bool:
         """Check if the Workbench Toolkit is available.
 
         Returns:
             bool: True if the Workbench Toolkit is available, False otherwise.
         """
-        try:
-            _logged_subprocess_run([self.executable, "-version"])
-        except subprocess.CalledProcessError:
-            return False
+        return _probe_workbench(self.executable)
+
+
+def _probe_workbench(executable: str) -> bool:
+    """Check whether a Workbench executable runs.
+
+    Only successful checks are cached, so an executable that is not available
+    yet is checked again on the next call.
+
+    Args:
+        executable: The path to the Workbench executable.
+
+    Returns:
+        bool: True if the Workbench Toolkit is available, False otherwise.
+    """
+    if executable in _AVAILABLE_EXECUTABLES:
         return True
+    try:
+        _logged_subprocess_run([executable, "-version"])
+    except subprocess.CalledProcessError:
+        return False
+    _AVAILABLE_EXECUTABLES.add(executable)
+    return True
+
+
+def _check_surface_to_volume_files(
+    metric: pathlib.Path,
+    surface: pathlib.Path,
+    volume_space: pathlib.Path,
+    volume_out: pathlib.Path,
+) -> None:
+    """Check the files of a surface to volume conversion.
+
+    Args:
+        metric: The metric file.
+        surface: The surface file.
+        volume_space: The volume space file.
+        volume_out: The output volume file.
+
+    """
+    _raise_error_if_file_does_not_exist(metric)
+    _raise_error_if_file_does_not_exist(surface)
+    _raise_error_if_file_does_not_exist(volume_space)
+    _raise_error_if_file_exists(volume_out)
 
 
 def _raise_error_if_file_exists(file: pathlib.Path) -> None:
@@ -195,3 +278,30 @@ def _logged_subprocess_run(command: list[str]) -> None:
     """Run a command and log the input."""
     logger.info("Running command: %s", " ".join(command))
     subprocess.run(command, check=True)  # noqa: S603
+
+
+def _logged_subprocess_run_concurrent(commands: Sequence[list[str]]) -> None:
+    """Run commands concurrently and log the input.
+
+    Args:
+        commands: The commands to run.
+
+    Raises:
+        subprocess.CalledProcessError: If any of the commands fails.
+
+    """
+    processes: list[subprocess.Popen] = []
+    try:
+        for command in commands:
+            logger.info("Running command: %s", " ".join(command))
+            processes.append(subprocess.Popen(command))  # noqa: S603
+        return_codes = [process.wait() for process in processes]
+    except BaseException:
+        # Do not leave started processes running if a launch or wait fails.
+        for process in processes:
+            process.kill()
+            process.wait()
+        raise
+    for command, return_code in zip(commands, return_codes, strict=True):
+        if return_code != 0:
+            raise subprocess.CalledProcessError(return_code, command)
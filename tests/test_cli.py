@@ -1,14 +1,20 @@
 """Test the command-line interface."""
+import argparse
 import logging
 import pathlib
 import sys
 
 import pytest
-from pytest_mock import plugin
 
 from csm_offline import cli
 
 
+@pytest.fixture(scope="session")
+def parser() -> argparse.ArgumentParser:
+    """Return the command line argument parser."""
+    return cli.build_parser()
+
+
 @pytest.fixture()
 def basic_arguments() -> list[str]:
     """Return a list of basic arguments."""
@@ -22,13 +28,14 @@ def basic_arguments() -> list[str]:
 
 
 def test_parse_valid_arguments(
-    mocker: plugin.MockerFixture,
+    monkeypatch: pytest.MonkeyPatch,
+    parser: argparse.ArgumentParser,
     basic_arguments: list[str],
 ) -> None:
     """Test that the arguments are parsed correctly."""
-    mocker.patch.object(sys, "argv", basic_arguments)
+    monkeypatch.setattr(sys, "argv", basic_arguments)
 
-    args = cli.parse_arguments()
+    args = cli.parse_arguments(parser)
 
     assert args.input_left == pathlib.Path("/path/to/left")
     assert args.input_right == pathlib.Path("/path/to/right")
@@ -39,45 +46,57 @@ def test_parse_valid_arguments(
     assert args.verbosity is None
 
 
-def test_parse_missing_required_arguments() -> None:
+def test_build_parser_reusable(
+    parser: argparse.ArgumentParser,
+    basic_arguments: list[str],
+) -> None:
+    """Test that a single parser can parse multiple sets of arguments."""
+    first = parser.parse_args(basic_arguments[1:])
+    second = parser.parse_args([*basic_arguments[1:], "-s", "macaque"])
+
+    assert first.species == "human"
+    assert second.species == "macaque"
+    assert first.input_left == second.input_left
+
+
+def test_parse_missing_required_arguments(
+    parser: argparse.ArgumentParser,
+) -> None:
     """Test that the parser exits when required arguments are missing."""
     with pytest.raises(SystemExit):
-        cli.parse_arguments()
+        parser.parse_args([])
 
 
 def test_parse_custom_verbosity_level(
-    mocker: plugin.MockerFixture,
+    parser: argparse.ArgumentParser,
     basic_arguments: list[str],
 ) -> None:
     """Test that the parser accepts a custom verbosity level."""
-    arguments = [*basic_arguments, "-v", "debug"]
-    mocker.patch.object(sys, "argv", arguments)
+    arguments = [*basic_arguments[1:], "-v", "debug"]
 
-    args = cli.parse_arguments()
+    args = parser.parse_args(arguments)
 
     assert args.verbosity == logging.DEBUG
 
 
 def test_parse_valid_species_choice(
-    mocker: plugin.MockerFixture,
+    parser: argparse.ArgumentParser,
     basic_arguments: list[str],
 ) -> None:
     """Test that the parser accepts a valid species choice."""
-    arguments = [*basic_arguments, "-s", "macaque"]
-    mocker.patch.object(sys, "argv", arguments)
+    arguments = [*basic_arguments[1:], "-s", "macaque"]
 
-    args = cli.parse_arguments()
+    args = parser.parse_args(arguments)
 
     assert args.species == "macaque"
 
 
 def test_parse_invalid_species_choice(
-    mocker: plugin.MockerFixture,
+    parser: argparse.ArgumentParser,
     basic_arguments: list[str],
 ) -> None:
     """Test that the parser exits when an invalid species choice is given."""
-    arguments = [*basic_arguments, "-s", "unknown_species"]
-    mocker.patch.object(sys, "argv", arguments)
+    arguments = [*basic_arguments[1:], "-s", "unknown_species"]
 
     with pytest.raises(SystemExit):
-        cli.parse_arguments()
+        parser.parse_args(arguments)
@@ -1,5 +1,7 @@
 """Test the image_search module."""
+import functools
 import pathlib
+from collections.abc import Iterator
 
 import pandas as pd
 import pytest
@@ -7,21 +9,32 @@ from pytest_mock import plugin
 
 from csm_offline import image_search
 
-template_output = {
-    "image": "my_path",
-    "studies": pd.DataFrame({"col1": [1, 2], "col2": [3, 4]}),
-    "terms": pd.DataFrame({"col1": [5, 6], "col2": [7, 8]}),
-}
+
+@functools.lru_cache(maxsize=1)
+def _template_output() -> dict[str, str | pd.DataFrame]:
+    """Return the output of the mock NeuroQuery search, built only once."""
+    return {
+        "image": "my_path",
+        "studies": pd.DataFrame({"col1": [1, 2], "col2": [3, 4]}),
+        "terms": pd.DataFrame({"col1": [5, 6], "col2": [7, 8]}),
+    }
 
 
 @pytest.fixture()
-def mock_neuroquery(mocker: plugin.MockerFixture) -> plugin.MockerFixture:
-    """Return a mock NeuroQueryImageSearch class."""
-    return mocker.patch(
+def mock_neuroquery(
+    mocker: plugin.MockerFixture,
+) -> Iterator[plugin.MockerFixture]:
+    """Return a mock NeuroQueryImageSearch class.
+
+    The cached engine is cleared before and after each test so that the mock
+    does not leak into other tests.
+    """
+    image_search.get_engine.cache_clear()
+    yield mocker.patch(
         "csm_offline.image_search.neuroquery_image_search.NeuroQueryImageSearch",
-        autospec=True,
-        return_value=lambda image_path, n_studies, n_terms: template_output,
+        return_value=lambda image_path, n_studies, n_terms: _template_output(),
     )
+    image_search.get_engine.cache_clear()
 
 
 def test_search_valid_input(mock_neuroquery: plugin.MockerFixture) -> None:
@@ -29,8 +42,18 @@ def test_search_valid_input(mock_neuroquery: plugin.MockerFixture) -> None:
     image_path = pathlib.Path("/path/to/image")
     n_studies = 1
     n_terms = 1
-    expected = template_output
+    expected = _template_output()
 
     result = image_search.search(image_path, n_studies, n_terms)
 
     assert result == expected
+
+
+def test_search_loads_engine_once(mock_neuroquery: plugin.MockType) -> None:
+    """Test that repeated searches reuse the NeuroQuery model."""
+    image_path = pathlib.Path("/path/to/image")
+
+    image_search.search(image_path)
+    image_search.search(image_path)
+
+    assert mock_neuroquery.call_count == 1
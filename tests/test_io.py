@@ -1,29 +1,47 @@
 """Tests for the io module."""
 import pathlib
+import types
 
 import h5py
-import nibabel
 import numpy as np
 import pytest
+from nibabel.gifti import GiftiImage
+from nibabel.gifti.util import gifti_encoding_codes
 from pytest_mock import plugin
 
 from csm_offline import io
 
-generator = np.random.default_rng()
 
+@pytest.fixture(scope="session")
+def rand_pool(tmp_path_factory: pytest.TempPathFactory) -> np.ndarray:
+    """Return a read-only pool of random numbers shared by the io tests.
 
-@pytest.fixture()
-def mock_data() -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
-    """Return mock data."""
-    size = (100, 10)
-    human_left = generator.random(size)
-    human_right = generator.random(size)
-    macaque_left = generator.random(size)
-    macaque_right = generator.random(size)
-    return human_left, human_right, macaque_left, macaque_right
+    Tests take disjoint slices of the pool so their data is independent.
+    """
+    file_path = tmp_path_factory.mktemp("pool") / "pool.npy"
+    np.save(file_path, np.random.default_rng(0).random((1000, 10)))
+    return np.load(file_path, mmap_mode="r")
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
+def mock_data(
+    rand_pool: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Return mock data.
+
+    The arrays are shared by all tests, so they are made read-only.
+    """
+    human_left, human_right, macaque_left, macaque_right = (
+        np.array(rand_pool[start : start + 100], dtype=np.float32)
+        for start in range(0, 400, 100)
+    )
+    arrays = human_left, human_right, macaque_left, macaque_right
+    for array in arrays:
+        array.flags.writeable = False
+    return arrays
+
+
+@pytest.fixture(scope="session")
 def feature_data(
     mock_data: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
 ) -> io.FeatureData:
@@ -32,31 +50,69 @@ def feature_data(
     return io.FeatureData(human_left, human_right, macaque_left, macaque_right)
 
 
+@pytest.fixture(scope="session")
+def h5_file(
+    tmp_path_factory: pytest.TempPathFactory,
+    rand_pool: np.ndarray,
+) -> tuple[pathlib.Path, np.ndarray]:
+    """Return the path to an HDF5 feature file and the data stored in it."""
+    data = rand_pool[400:420]
+    file_path = tmp_path_factory.mktemp("h5") / "test_file.h5"
+    with h5py.File(file_path, "w", libver="latest") as h5:
+        h5.create_dataset("data", data=data, chunks=None)
+    return file_path, data
+
+
 def test_from_data_dir_valid(
     mocker: plugin.MockerFixture,
     mock_data: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
 ) -> None:
     """Test FeatureData.from_data_dir with valid data."""
-    mocker.patch("csm_offline.io.FeatureData.load_from_h5", return_value=mock_data)
+    sides = ("human_left", "human_right", "macaque_left", "macaque_right")
+    files = {
+        io.FeatureFiles[side.upper()].value: array
+        for side, array in zip(sides, mock_data, strict=True)
+    }
+    mocker.patch("csm_offline.io.FeatureData.load_from_h5", side_effect=files.get)
 
     result = io.FeatureData.from_data_dir()
 
+    for side, array in zip(sides, mock_data, strict=True):
+        np.testing.assert_array_equal(
+            getattr(result, side),
+            array,
+            f"{side} should match the data loaded from its file.",
+        )
+
+
+def test_load_from_h5_valid(h5_file: tuple[pathlib.Path, np.ndarray]) -> None:
+    """Test FeatureData.load_from_h5 with valid HDF5 file."""
+    file_path, data = h5_file
+
+    result = io.FeatureData.load_from_h5(file_path)
+
+    assert result.dtype == np.float32
     np.testing.assert_array_equal(
-        result.human_left,
-        mock_data,
+        result,
+        data.astype(np.float32),
         "Data loaded from file should match the original data.",
     )
 
 
-def test_load_from_h5_valid(tmp_path: pathlib.Path) -> None:
-    """Test FeatureData.load_from_h5 with valid HDF5 file."""
-    data = generator.random((20, 10))
+def test_load_from_h5_float32(
+    tmp_path: pathlib.Path,
+    rand_pool: np.ndarray,
+) -> None:
+    """Test FeatureData.load_from_h5 with a contiguous float32 HDF5 dataset."""
+    data = np.array(rand_pool[460:480], dtype=np.float32)
     file_path = tmp_path / "test_file.h5"
     with h5py.File(file_path, "w") as h5:
-        h5.create_dataset("data", data=data)
+        h5.create_dataset("data", data=data, chunks=None)
 
     result = io.FeatureData.load_from_h5(file_path)
 
+    assert isinstance(result, np.memmap)
+    assert not result.flags.writeable
     np.testing.assert_array_equal(
         result,
         data,
@@ -64,70 +120,155 @@ def test_load_from_h5_valid(tmp_path: pathlib.Path) -> None:
     )
 
 
-def test_feature_similarity_valid(feature_data: io.FeatureData) -> None:
+def test_load_from_h5_chunked(
+    tmp_path: pathlib.Path,
+    rand_pool: np.ndarray,
+) -> None:
+    """Test FeatureData.load_from_h5 with a compressed HDF5 dataset."""
+    data = np.array(rand_pool[420:440], dtype=np.float32)
+    file_path = tmp_path / "test_file.h5"
+    with h5py.File(file_path, "w") as h5:
+        h5.create_dataset("data", data=data, chunks=True, compression="gzip")
+
+    result = io.FeatureData.load_from_h5(file_path)
+
+    np.testing.assert_array_equal(
+        result,
+        data,
+        "Data loaded from file should match the original data.",
+    )
+
+
+@pytest.fixture(scope="session")
+def similarity_weights(feature_data: io.FeatureData) -> np.ndarray:
+    """Return weights over the human vertices of the feature data."""
+    weights = np.random.default_rng(1).random(feature_data.human.shape[0])
+    weights.flags.writeable = False
+    return weights
+
+
+def test_feature_similarity_valid(
+    feature_data: io.FeatureData,
+    similarity_weights: np.ndarray,
+) -> None:
     """Test FeatureData.feature_similarity with valid input."""
-    weights = generator.random(feature_data.human_left.shape[0] * 2)
     species = "human"
 
-    result = feature_data.feature_similarity(weights, species)
+    result = feature_data.feature_similarity(similarity_weights, species)
 
     assert isinstance(
         result,
         io.FeatureData,
     ), "Result should be an instance of FeatureData"
+    for side in ("human_left", "human_right", "macaque_left", "macaque_right"):
+        assert getattr(result, side).shape == getattr(feature_data, side).shape[:1]
 
 
-def test_human_property(feature_data: io.FeatureData) -> None:
-    """Test FeatureData human property."""
-    expected = np.concatenate(
-        (feature_data.human_left, feature_data.human_right),
-        axis=0,
-    )
+def test_feature_similarity_matches_cosine_similarity(
+    feature_data: io.FeatureData,
+    similarity_weights: np.ndarray,
+) -> None:
+    """Test that FeatureData.feature_similarity reuses the cosine similarity."""
+    user_feature = np.average(feature_data.human, weights=similarity_weights, axis=0)
+    expected = io._cosine_similarity(
+        np.atleast_2d(user_feature),
+        feature_data.all_data,
+    ).squeeze()
 
-    result = feature_data.human
+    result = feature_data.feature_similarity(similarity_weights, "human")
 
-    np.testing.assert_array_equal(
-        result,
-        expected,
-        "Human property should return concatenated human left and right",
-    )
+    np.testing.assert_allclose(result.all_data, expected, rtol=1e-5, atol=1e-6)
 
 
-def test_macaque_property(feature_data: io.FeatureData) -> None:
-    """Test FeatureData macaque property."""
-    expected = np.concatenate(
-        (feature_data.macaque_left, feature_data.macaque_right),
-        axis=0,
-    )
+def test_feature_similarity_zero_weights(feature_data: io.FeatureData) -> None:
+    """Test FeatureData.feature_similarity with weights that sum to zero."""
+    weights = np.zeros(feature_data.human_left.shape[0] * 2)
 
-    result = feature_data.macaque
+    with pytest.raises(ZeroDivisionError, match="Weights sum to zero"):
+        feature_data.feature_similarity(weights, "human")
 
-    np.testing.assert_array_equal(
-        result,
-        expected,
-        "Macaque property should return concatenated macaque left and right",
-    )
 
+def test_feature_data_copies_split_views(rand_pool: np.ndarray) -> None:
+    """Test that FeatureData does not alias the array its inputs were split from."""
+    data = np.array(rand_pool[440:444], dtype=np.float32).ravel()
+    parts = np.split(data, [10, 20, 30])
 
-def test_all_data_property(feature_data: io.FeatureData) -> None:
-    """Test FeatureData all_data property."""
-    expected = np.concatenate(
-        (feature_data.human, feature_data.macaque),
-        axis=0,
-    )
+    result = io.FeatureData(*parts)
+    data[0] = -1
+
+    assert not np.shares_memory(result.all_data, data)
+    assert result.human_left[0] == rand_pool[440, 0].astype(np.float32)
+
+
+def test_feature_similarity_wraps_similarity(
+    feature_data: io.FeatureData,
+    similarity_weights: np.ndarray,
+) -> None:
+    """Test that the hemispheres of the similarity are views of one array."""
+    result = feature_data.feature_similarity(similarity_weights, "human")
 
-    result = feature_data.all_data
+    for side in ("human_left", "human_right", "macaque_left", "macaque_right"):
+        assert np.shares_memory(getattr(result, side), result.all_data)
+
+
+def test_feature_data_copies_separate_arrays(
+    mock_data: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+) -> None:
+    """Test that FeatureData copies arrays that do not share a buffer."""
+    result = io.FeatureData(*mock_data)
+
+    for array in mock_data:
+        assert not np.shares_memory(result.all_data, array)
+
+
+@pytest.fixture(scope="session")
+def expected_concat(
+    mock_data: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+) -> types.SimpleNamespace:
+    """Return the expected concatenations of the FeatureData hemispheres."""
+    hemispheres = mock_data
+    n_vertices = [hemisphere.shape[0] for hemisphere in hemispheres]
+    n_features = hemispheres[0].shape[1]
+    all_data = np.empty((sum(n_vertices), n_features), dtype=np.float32)
+    human = np.empty((sum(n_vertices[:2]), n_features), dtype=np.float32)
+    macaque = np.empty((sum(n_vertices[2:]), n_features), dtype=np.float32)
+    np.concatenate(hemispheres, axis=0, out=all_data)
+    np.concatenate(hemispheres[:2], axis=0, out=human)
+    np.concatenate(hemispheres[2:], axis=0, out=macaque)
+    return types.SimpleNamespace(human=human, macaque=macaque, all_data=all_data)
+
+
+@pytest.mark.parametrize("attribute", ["human", "macaque", "all_data"])
+def test_concatenated_properties(
+    feature_data: io.FeatureData,
+    expected_concat: types.SimpleNamespace,
+    attribute: str,
+) -> None:
+    """Test the FeatureData human, macaque, and all_data properties."""
+    result = getattr(feature_data, attribute)
 
     np.testing.assert_array_equal(
         result,
-        expected,
-        "All_data property should return all feature data",
+        getattr(expected_concat, attribute),
+        f"{attribute} property should return the concatenated hemispheres",
     )
 
 
-def test_load_user_data_txt(tmp_path: pathlib.Path) -> None:
+@pytest.mark.parametrize("attribute", ["human", "macaque", "all_data"])
+def test_concatenated_properties_are_cached_views(
+    feature_data: io.FeatureData,
+    attribute: str,
+) -> None:
+    """Test that the concatenated properties are cached views of all_data."""
+    result = getattr(feature_data, attribute)
+
+    assert result is getattr(feature_data, attribute)
+    assert np.shares_memory(result, feature_data.all_data)
+
+
+def test_load_user_data_txt(tmp_path: pathlib.Path, rand_pool: np.ndarray) -> None:
     """Test load_user_data with valid text file."""
-    data = [generator.random((20, 10)), generator.random((20, 10))]
+    data = [rand_pool[450:455, :3], rand_pool[455:460, :3]]
     file_paths = []
     for index, array in enumerate(data):
         file_paths.append(tmp_path / f"test_file_{index}.txt")
@@ -152,7 +293,7 @@ def test_cosine_similarity_valid() -> None:
     """Test _cosine_similarity with valid input."""
     a = np.array([[1, 0], [0, 1]])
     b = np.array([[1, 0], [0, 1]])
-    expected = np.array([[0.9999, 0], [0, 0.9999]])
+    expected = np.array([[0.9999, 0], [0, 0.9999]], dtype=np.float32)
 
     result = io._cosine_similarity(a, b)
 
@@ -163,23 +304,81 @@ def test_cosine_similarity_valid() -> None:
     )
 
 
-def test_array_to_gifti(tmp_path: pathlib.Path) -> None:
-    """Test if the function saves a gifti file successfully."""
-    array = np.array([[1, 2], [3, 4]], dtype=np.float32)
-    file_path = tmp_path / "output.gii"
+def test_cosine_similarity_zero_vector() -> None:
+    """Test _cosine_similarity with vectors that have no direction."""
+    a = np.array([[0, 0], [np.nan, 1], [np.inf, 1]])
+    b = np.array([[1, 0], [0, 1]])
+    expected = np.zeros((3, 2), dtype=np.float32)
 
+    result = io._cosine_similarity(a, b)
+
+    np.testing.assert_array_equal(
+        result,
+        expected,
+        "Similarity to a zero, NaN, or infinite vector should be zero",
+    )
+
+
+def test_cosine_similarity_large_vector() -> None:
+    """Test _cosine_similarity with vectors whose squared norm overflows float32."""
+    a = np.array([[3e19, 1e19]])
+    b = np.array([[1, 2]])
+    expected = np.array([[0.7071068]], dtype=np.float32)
+
+    result = io._cosine_similarity(a, b)
+
+    np.testing.assert_allclose(result, expected, rtol=1e-6)
+
+
+@pytest.fixture(scope="session")
+def gifti_file(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> tuple[pathlib.Path, np.ndarray]:
+    """Return the path to a gifti file written by array_to_gifti and its data."""
+    array = np.array([[1, 2], [3, 4]], dtype=np.float32)
+    file_path = tmp_path_factory.mktemp("gii") / "output.gii"
     io.array_to_gifti(array, file_path)
+    return file_path, array
+
+
+def test_array_to_gifti(gifti_file: tuple[pathlib.Path, np.ndarray]) -> None:
+    """Test if the function saves a gifti file successfully."""
+    file_path, _ = gifti_file
 
     assert file_path.is_file()
 
 
-def test_gifti_file_content(tmp_path: pathlib.Path) -> None:
+def test_gifti_file_content(gifti_file: tuple[pathlib.Path, np.ndarray]) -> None:
     """Test if the gifti file contains correct data."""
-    array = np.array([[1, 2], [3, 4]], dtype=np.float32)
+    file_path, array = gifti_file
+
+    gii_img = GiftiImage.from_filename(file_path)
+    loaded_array = gii_img.darrays[0].data
+
+    np.testing.assert_array_equal(loaded_array, array, "Data should be the same.")
+
+
+def test_gifti_file_content_cast(tmp_path: pathlib.Path) -> None:
+    """Test if a float64 array is saved as float32 gifti data."""
+    array = np.array([[1, 2], [3, 4]], dtype=np.float64)
     file_path = tmp_path / "output.gii"
     io.array_to_gifti(array, file_path)
 
-    gii_img = nibabel.load(file_path)
-    loaded_array = gii_img.darrays[0].data  # type: ignore[attr-defined]
+    gii_img = GiftiImage.from_filename(file_path)
+    loaded_array = gii_img.darrays[0].data
 
+    assert loaded_array.dtype == np.float32
     np.testing.assert_array_equal(loaded_array, array, "Data should be the same.")
+
+
+def test_gifti_file_content_uncompressed(tmp_path: pathlib.Path) -> None:
+    """Test if an uncompressed gifti file contains correct data."""
+    array = np.array([[1, 2], [3, 4]], dtype=np.float32)
+    file_path = tmp_path / "output.gii"
+    io.array_to_gifti(array, file_path, compress=False)
+
+    gii_img = GiftiImage.from_filename(file_path)
+    data_array = gii_img.darrays[0]
+
+    assert data_array.encoding == gifti_encoding_codes.code["GIFTI_ENCODING_B64BIN"]
+    np.testing.assert_array_equal(data_array.data, array, "Data should be the same.")
@@ -0,0 +1,86 @@
+"""Tests for the __main__ module."""
+import pathlib
+
+import numpy as np
+import pandas as pd
+import pytest
+from pytest_mock import plugin
+
+from csm_offline import __main__ as csm_main
+from csm_offline import io
+
+
+@pytest.fixture()
+def similarity() -> io.FeatureData:
+    """Return similarity maps with a few vertices per hemisphere."""
+    return io.FeatureData(*np.split(np.linspace(0, 1, 8), [2, 4, 6]))
+
+
+@pytest.fixture()
+def mock_pipeline(
+    mocker: plugin.MockerFixture,
+    tmp_path: pathlib.Path,
+    similarity: io.FeatureData,
+) -> dict[str, plugin.MockType]:
+    """Mock the data, Workbench, and NeuroQuery calls of the application."""
+    mocker.patch.object(csm_main, "OUTPUT_DIR", tmp_path)
+    mocker.patch("csm_offline.config.setup_logger")
+    mock_features = mocker.patch("csm_offline.io.FeatureData.from_data_dir")
+    mock_features.return_value.feature_similarity.return_value = similarity
+    mocker.patch("csm_offline.io.load_user_data", return_value=np.ones(4))
+    mocker.patch("csm_offline.workbench.multi_surface_to_volume")
+    mocker.patch("csm_offline.image_search.get_engine")
+    mocker.patch(
+        "csm_offline.image_search.search",
+        return_value={
+            "image": "my_path",
+            "studies": pd.DataFrame({"title": ["study"]}),
+            "terms": pd.DataFrame({"term": ["term"]}),
+        },
+    )
+    return {
+        "from_data_dir": mock_features,
+        "array_to_gifti": mocker.patch("csm_offline.io.array_to_gifti"),
+    }
+
+
+def test_serve_loads_feature_data_once(
+    tmp_path: pathlib.Path,
+    mock_pipeline: dict[str, plugin.MockType],
+) -> None:
+    """Test that serve shares the feature data across runs."""
+    argument_lists = [
+        ["left.gii", "right.gii", "-o", "first"],
+        ["left.gii", "right.gii", "-o", "second"],
+    ]
+
+    csm_main.serve(argument_lists)
+
+    mock_pipeline["from_data_dir"].assert_called_once_with()
+    features = mock_pipeline["from_data_dir"].return_value
+    assert features.feature_similarity.call_count == len(argument_lists)
+    for prefix in ("first", "second"):
+        assert (tmp_path / f"{prefix}_neuroquery_terms.json").is_file()
+
+
+def test_run_saves_similarity_and_neuroquery(
+    tmp_path: pathlib.Path,
+    similarity: io.FeatureData,
+    mock_pipeline: dict[str, plugin.MockType],
+) -> None:
+    """Test that run saves the similarity maps and the NeuroQuery output."""
+    args = csm_main.cli.build_parser().parse_args(["left.gii", "right.gii"])
+
+    csm_main.run(args)
+
+    saved = {
+        call.args[1]: call.args[0]
+        for call in mock_pipeline["array_to_gifti"].call_args_list
+    }
+    for species in ("human", "macaque"):
+        for side in ("left", "right"):
+            filepath = tmp_path / f"csm_offline_output_{species}_{side}.func.gii"
+            assert saved[filepath] is getattr(similarity, f"{species}_{side}")
+    for dataframe_name in ("terms", "studies"):
+        filepath = tmp_path / f"csm_offline_output_neuroquery_{dataframe_name}.json"
+        assert not pd.read_json(filepath, orient="records").empty
@@ -1,5 +1,6 @@
 """Tests for the workbench module."""
 import pathlib
+import subprocess
 
 import pytest
 from pytest_mock import plugin
@@ -7,10 +8,25 @@ from pytest_mock import plugin
 from csm_offline import workbench
 
 
+@pytest.fixture(scope="module", autouse=True)
+def mock_subprocess_run(module_mocker: plugin.MockerFixture) -> plugin.MockType:
+    """Return a mock subprocess.run function shared by all tests in this module."""
+    return module_mocker.patch("subprocess.run")
+
+
+@pytest.fixture(autouse=True)
+def _reset_subprocess_run(mock_subprocess_run: plugin.MockType) -> None:
+    """Reset the subprocess.run mock and the cached Workbench check per test."""
+    mock_subprocess_run.reset_mock(side_effect=True)
+    workbench._AVAILABLE_EXECUTABLES.clear()
+
+
 @pytest.fixture()
-def mock_subprocess_run(mocker: plugin.MockerFixture) -> plugin.MockType:
-    """Return a mock subprocess.run function."""
-    return mocker.patch("subprocess.run", autospec=True)
+def mock_subprocess_popen(mocker: plugin.MockerFixture) -> plugin.MockType:
+    """Return a mock subprocess.Popen class whose processes succeed."""
+    mock_popen = mocker.patch("subprocess.Popen")
+    mock_popen.return_value.wait.return_value = 0
+    return mock_popen
 
 
 @pytest.fixture()
@@ -27,44 +43,106 @@ def mock_logger_exception(mocker: plugin.MockerFixture) -> plugin.MockType:
     return mocker.patch("csm_offline.workbench.logger.exception", autospec=True)
 
 
-@pytest.fixture()
-def mock_is_workbench_available(mocker: plugin.MockerFixture) -> plugin.MockType:
+@pytest.fixture(scope="module", autouse=True)
+def mock_is_workbench_available(
+    module_mocker: plugin.MockerFixture,
+) -> plugin.MockType:
     """A mock Workbench._is_workbench_available function that always returns True."""
-    return mocker.patch.object(
+    return module_mocker.patch.object(
         workbench.Workbench,
         "_is_workbench_available",
         return_value=True,
     )
 
 
+@pytest.fixture(scope="session")
+def wb_tmp(tmp_path_factory: pytest.TempPathFactory) -> pathlib.Path:
+    """Return a directory with metric, surface, and volume space input files."""
+    directory = tmp_path_factory.mktemp("wb")
+    for name in ("metric1", "metric2", "surface1", "surface2", "volume_space"):
+        (directory / name).touch()
+    return directory
+
+
 def test_multi_surface_to_volume_success(
-    tmp_path: pathlib.Path,
+    wb_tmp: pathlib.Path,
     workbench_instance: workbench.Workbench,
     mock_subprocess_run: plugin.MockType,
+    mock_subprocess_popen: plugin.MockType,
     mock_logger_exception: plugin.MockType,
 ) -> None:
     """Test successful run of multi_surface_to_volume."""
-    metrics = [tmp_path / "metric1", tmp_path / "metric2"]
-    surfaces = [tmp_path / "surface1", tmp_path / "surface2"]
-    volume_space = [tmp_path / "volume_space"]
-    for test_file in metrics + surfaces + volume_space:
-        test_file.touch()
+    metrics = [wb_tmp / "metric1", wb_tmp / "metric2"]
+    surfaces = [wb_tmp / "surface1", wb_tmp / "surface2"]
+    volume_space = wb_tmp / "volume_space"
     volume_out = pathlib.Path("volume_out")
     distance = 3.0
-    expected_workbench_calls = (
-        5
-    )  # 1 for volume math, 2 for surf2vol, 2 for check if workbench exists
+    expected_run_calls = 1  # 1 for volume math
+    expected_popen_calls = 2  # 1 surf2vol per hemisphere, run concurrently
 
     workbench.multi_surface_to_volume(
         metrics,
         surfaces,
-        volume_space[0],
+        volume_space,
         volume_out,
         distance,
     )
 
     assert mock_logger_exception.call_count == 0
-    assert mock_subprocess_run.call_count == expected_workbench_calls
+    assert mock_subprocess_run.call_count == expected_run_calls
+    assert mock_subprocess_popen.call_count == expected_popen_calls
+    volume_math_command = mock_subprocess_run.call_args.args[0]
+    assert volume_math_command[1:3] == [
+        "-volume-math",
+        "(x0 + x1) / max(1, (x0 != 0) + (x1 != 0))",
+    ]
+
+
+def test_multi_surface_to_volume_conversion_fails(
+    wb_tmp: pathlib.Path,
+    workbench_instance: workbench.Workbench,
+    mock_subprocess_run: plugin.MockType,
+    mock_subprocess_popen: plugin.MockType,
+) -> None:
+    """Test multi_surface_to_volume when a surface to volume conversion fails."""
+    metrics = [wb_tmp / "metric1", wb_tmp / "metric2"]
+    surfaces = [wb_tmp / "surface1", wb_tmp / "surface2"]
+    volume_space = wb_tmp / "volume_space"
+    mock_subprocess_popen.return_value.wait.return_value = 1
+
+    with pytest.raises(subprocess.CalledProcessError):
+        workbench.multi_surface_to_volume(
+            metrics,
+            surfaces,
+            volume_space,
+            pathlib.Path("volume_out"),
+        )
+
+    assert mock_subprocess_popen.call_count == len(metrics)
+
+
+def test_multi_surface_to_volume_launch_fails(
+    wb_tmp: pathlib.Path,
+    workbench_instance: workbench.Workbench,
+    mock_subprocess_popen: plugin.MockType,
+) -> None:
+    """Test that started conversions are stopped when a later one cannot launch."""
+    metrics = [wb_tmp / "metric1", wb_tmp / "metric2"]
+    surfaces = [wb_tmp / "surface1", wb_tmp / "surface2"]
+    volume_space = wb_tmp / "volume_space"
+    started_process = mock_subprocess_popen.return_value
+    mock_subprocess_popen.side_effect = [started_process, OSError]
+
+    with pytest.raises(OSError):  # noqa: PT011
+        workbench.multi_surface_to_volume(
+            metrics,
+            surfaces,
+            volume_space,
+            pathlib.Path("volume_out"),
+        )
+
+    started_process.kill.assert_called_once_with()
+    started_process.wait.assert_called_once_with()
 
 
 def test_multi_surface_to_volume_mismatched_lengths(
@@ -106,7 +184,7 @@ def test_workbench_surface_to_volume_file_does_not_exist(
         )
 
     assert mock_logger_exception.call_count == 1
-    assert mock_subprocess_run.call_count == 1  # Call to check if Workbench exists.
+    assert mock_subprocess_run.call_count == 0
 
 
 def test_workbench_volume_math_file_exists(
@@ -125,7 +203,7 @@ def test_workbench_volume_math_file_exists(
         workbench_instance.volume_math(expression, volume_out, volume_files)
 
     assert mock_logger_exception.call_count == 1
-    assert mock_subprocess_run.call_count == 1  # Call to check if Workbench exists.
+    assert mock_subprocess_run.call_count == 0
 
 
 def test_workbench_init_workbench_not_available(mocker: plugin.MockType) -> None:
@@ -144,3 +222,58 @@ def test_workbench_init_workbench_not_available(mocker: plugin.MockType) -> None
         workbench.Workbench()
 
     mock_logger_exception.assert_called_once_with("Workbench not available.")
+
+
+def test_probe_workbench_available(mock_subprocess_run: plugin.MockType) -> None:
+    """Test that the Workbench check runs the version command once."""
+    assert workbench._probe_workbench("wb_command")
+    assert workbench._probe_workbench("wb_command")
+
+    mock_subprocess_run.assert_called_once_with(
+        ["wb_command", "-version"],
+        check=True,
+    )
+
+
+def test_probe_workbench_not_available(mock_subprocess_run: plugin.MockType) -> None:
+    """Test the Workbench check when the version command fails."""
+    mock_subprocess_run.side_effect = subprocess.CalledProcessError(1, "wb_command")
+
+    assert not workbench._probe_workbench("wb_command")
+
+
+def test_workbench_surface_to_volume_command(
+    workbench_instance: workbench.Workbench,
+    mock_logger_exception: plugin.MockType,
+) -> None:
+    """Test that building the conversion command has no side effects."""
+    command = workbench_instance.surface_to_volume_command(
+        pathlib.Path("metric"),
+        pathlib.Path("surface"),
+        pathlib.Path("volume_space"),
+        pathlib.Path("volume_out"),
+        2.0,
+    )
+
+    assert command[1:] == [
+        "-metric-to-volume-mapping",
+        "metric",
+        "surface",
+        "volume_space",
+        "volume_out",
+        "-nearest-vertex",
+        "2.0",
+    ]
+    assert mock_logger_exception.call_count == 0
+
+
+def test_probe_workbench_retries_failure(mock_subprocess_run: plugin.MockType) -> None:
+    """Test that a failed Workbench check is not cached."""
+    mock_subprocess_run.side_effect = [
+        subprocess.CalledProcessError(1, "wb_command"),
+        None,
+    ]
+
+    assert not workbench._probe_workbench("wb_command")
+    assert workbench._probe_workbench("wb_command")
+    assert mock_subprocess_run.call_count == 2  # noqa: PLR2004